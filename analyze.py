@@ -1,18 +1,22 @@
-import pandas as pd
-import requests
 import json
 from collections import Counter
-import numpy as np
 from typing import List, Dict
-from openai import OpenAI
 from datetime import datetime
 import os
+from report import ASPECTS, ReportAggregate, render_report
+
+# pandas / openai / requests 体积较大，只在真正需要的方法内导入，
+# 以便只渲染报告的命令可以快速启动
+
+# 详细分析表中各方面对应的列名前缀
+ASPECT_COLUMNS = {key: short for key, _, short, _ in ASPECTS}
 
 class JDReviewAnalyzer:
     def __init__(self, api_key: str):
         """初始化分析器"""
         if not api_key:
             raise ValueError("必须提供有效的API密钥")
+        from openai import OpenAI
         self.client = OpenAI(
             api_key=api_key,
             base_url="https://api.deepseek.com/v1"
@@ -20,6 +24,7 @@ class JDReviewAnalyzer:
 
     def analyze_sentiment(self, text: str) -> Dict:
         """调用DeepSeek API分析评论情感"""
+        import requests
         try:
             payload = {
                 "text": text,
@@ -106,28 +111,13 @@ class JDReviewAnalyzer:
 
     def analyze_reviews(self, reviews_file: str, limit: int = 100) -> Dict:
         """分析评论并生成总结报告"""
+        import pandas as pd
+
         # 读取评论数据
         df = pd.read_csv(reviews_file, encoding='utf-8')
         if limit:
             df = df.head(limit)
         
-        # 初始化统计数据
-        aspect_stats = {
-            'ai_feature': {'positive': 0, 'negative': 0, 'neutral': 0, 'mixed': 0, 'mentioned': 0},
-            'sound_quality': {'positive': 0, 'negative': 0, 'neutral': 0, 'mixed': 0, 'mentioned': 0},
-            'appearance': {'positive': 0, 'negative': 0, 'neutral': 0, 'mixed': 0, 'mentioned': 0}
-        }
-        
-        regional_stats = {}  # 地域统计
-        model_stats = {}    # 款式统计
-        score_stats = {1: 0, 2: 0, 3: 0, 4: 0, 5: 0}  # 评分统计
-        
-        detailed_comments = {
-            'ai_feature': [],
-            'sound_quality': [],
-            'appearance': []
-        }
-        
         # 创建详细分析结果DataFrame
         analysis_details = []
         
@@ -145,76 +135,15 @@ class JDReviewAnalyzer:
                 '评论内容': review_text,
                 '地区': region,
                 '商品款式': model,
-                '评分': score,
-                'AI功能_提及': aspects['ai_feature']['mentioned'],
-                'AI功能_情感': aspects['ai_feature']['sentiment'],
-                'AI功能_具体评价': aspects['ai_feature']['comment'],
-                '音质_提及': aspects['sound_quality']['mentioned'],
-                '音质_情感': aspects['sound_quality']['sentiment'],
-                '音质_具体评价': aspects['sound_quality']['comment'],
-                '外观_提及': aspects['appearance']['mentioned'],
-                '外观_情感': aspects['appearance']['sentiment'],
-                '外观_具体评价': aspects['appearance']['comment']
+                '评分': score
             }
+            for aspect, prefix in ASPECT_COLUMNS.items():
+                analysis_row[f'{prefix}_提及'] = aspects[aspect]['mentioned']
+                analysis_row[f'{prefix}_情感'] = aspects[aspect]['sentiment']
+                analysis_row[f'{prefix}_具体评价'] = aspects[aspect]['comment']
             analysis_details.append(analysis_row)
-            
-            # 更新地域统计
-            if region not in regional_stats:
-                regional_stats[region] = {
-                    'count': 0,
-                    'ai_positive': 0,
-                    'sound_positive': 0,
-                    'appearance_positive': 0,
-                    'avg_score': 0.0
-                }
-            regional_stats[region]['count'] += 1
-            regional_stats[region]['avg_score'] += score
-            
-            # 更新款式统计
-            if model not in model_stats:
-                model_stats[model] = {
-                    'count': 0,
-                    'ai_positive': 0,
-                    'sound_positive': 0,
-                    'appearance_positive': 0,
-                    'avg_score': 0.0
-                }
-            model_stats[model]['count'] += 1
-            model_stats[model]['avg_score'] += score
-            
-            # 更新评分统计
-            score_stats[score] += 1
-            
-            # 更新各方面统计
-            for aspect, data in aspects.items():
-                if data['mentioned']:
-                    aspect_stats[aspect]['mentioned'] += 1
-                    aspect_stats[aspect][data['sentiment']] += 1
-                    if data['comment']:
-                        detailed_comments[aspect].append({
-                            'comment': data['comment'],
-                            'region': region,
-                            'model': model,
-                            'score': score
-                        })
-                    
-                    # 更新地域和款式的正面评价统计
-                    if data['sentiment'] == 'positive':
-                        if aspect == 'ai_feature':
-                            regional_stats[region]['ai_positive'] += 1
-                            model_stats[model]['ai_positive'] += 1
-                        elif aspect == 'sound_quality':
-                            regional_stats[region]['sound_positive'] += 1
-                            model_stats[model]['sound_positive'] += 1
-                        elif aspect == 'appearance':
-                            regional_stats[region]['appearance_positive'] += 1
-                            model_stats[model]['appearance_positive'] += 1
-            
-        # 计算地域和款式的平均分
-        for region in regional_stats:
-            regional_stats[region]['avg_score'] /= regional_stats[region]['count']
-        for model in model_stats:
-            model_stats[model]['avg_score'] /= model_stats[model]['count']
+        
+        analysis_result = aggregate_analysis(analysis_details)
         
         # 创建详细分析Excel
         analysis_df = pd.DataFrame(analysis_details)
@@ -222,175 +151,89 @@ class JDReviewAnalyzer:
         analysis_df.to_excel(output_file, index=False)
         
         # 返回分析结果
-        return {
-            '总评论数': len(df),
-            '各方面统计': aspect_stats,
-            '地域统计': regional_stats,
-            '款式统计': model_stats,
-            '评分统计': score_stats,
-            '详细评价': detailed_comments,
-            '分析文件': output_file  # 添加输出文件路径到返回结果中
-        }
-
-    def generate_report(self, analysis_result: Dict) -> str:
-        """生成分析报告"""
-        total_reviews = analysis_result['总评论数']
-        stats = analysis_result['各方面统计']
-        regional_stats = analysis_result['地域统计']
-        model_stats = analysis_result['款式统计']
-        score_stats = analysis_result['评分统计']
-        
-        def get_sentiment_percentage(aspect: str, sentiment: str) -> str:
-            if stats[aspect]['mentioned'] == 0:
-                return "0%"
-            return f"{(stats[aspect][sentiment] / stats[aspect]['mentioned'] * 100):.1f}%"
-        
-        report = f"""
-京东商品评论分析报告
-==================================================
-分析样本: {total_reviews}条评论
-分析时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-
-评分分布
-------------------
-• 总体评分: {sum([score * count for score, count in score_stats.items()]) / total_reviews:.1f}
-• 评分分布:
-  - 5星: {(score_stats[5] / total_reviews * 100):.1f}% ({score_stats[5]}条)
-  - 4星: {(score_stats[4] / total_reviews * 100):.1f}% ({score_stats[4]}条)
-  - 3星: {(score_stats[3] / total_reviews * 100):.1f}% ({score_stats[3]}条)
-  - 2星: {(score_stats[2] / total_reviews * 100):.1f}% ({score_stats[2]}条)
-  - 1星: {(score_stats[1] / total_reviews * 100):.1f}% ({score_stats[1]}条)
+        analysis_result['分析文件'] = output_file  # 添加输出文件路径到返回结果中
+        return analysis_result
 
-地域分析
-------------------
-"""
-        # 添加地域分析
-        sorted_regions = sorted(regional_stats.items(), 
-                              key=lambda x: x[1]['count'], 
-                              reverse=True)[:5]
-        for region, data in sorted_regions:
-            report += f"""
-• {region}:
-  - 评论数量: {data['count']}条 ({(data['count'] / total_reviews * 100):.1f}%)
-  - 平均评分: {data['avg_score']:.1f}
-  - AI功能好评率: {(data['ai_positive'] / data['count'] * 100):.1f}%
-  - 音质好评率: {(data['sound_positive'] / data['count'] * 100):.1f}%
-  - 外观好评率: {(data['appearance_positive'] / data['count'] * 100):.1f}%"""
+    def generate_report(self, analysis_result: Dict, fmt: str = 'text') -> str:
+        """生成分析报告，支持 text/markdown/html/json 格式"""
+        return render_report(ReportAggregate(analysis_result), fmt)
 
-        report += """
+def aggregate_analysis(analysis_details: List[Dict]) -> Dict:
+    """把逐条评论的分析结果汇总为统计数据
 
-款式分析
-------------------
-"""
-        # 添加款式分析
-        sorted_models = sorted(model_stats.items(), 
-                             key=lambda x: x[1]['count'], 
-                             reverse=True)
-        for model, data in sorted_models:
-            report += f"""
-• {model}:
-  - 销量占比: {(data['count'] / total_reviews * 100):.1f}% ({data['count']}条)
-  - 平均评分: {data['avg_score']:.1f}
-  - AI功能好评率: {(data['ai_positive'] / data['count'] * 100):.1f}%
-  - 音质好评率: {(data['sound_positive'] / data['count'] * 100):.1f}%
-  - 外观好评率: {(data['appearance_positive'] / data['count'] * 100):.1f}%"""
-
-        report += """
-
-功能分析
-------------------
-"""
-        # 添加原有的功能分析部分
-        aspects = [
-            ('AI功能', 'ai_feature'),
-            ('音质体验', 'sound_quality'),
-            ('外观设计', 'appearance')
-        ]
-        
-        for aspect_name, aspect_key in aspects:
-            report += f"""
-{aspect_name}:
-• 提及率: {(stats[aspect_key]['mentioned'] / total_reviews * 100):.1f}% ({stats[aspect_key]['mentioned']}/{total_reviews})
-• 情感分布:
-  - 正面评价: {get_sentiment_percentage(aspect_key, 'positive')} ({stats[aspect_key]['positive']}条)
-  - 负面评价: {get_sentiment_percentage(aspect_key, 'negative')} ({stats[aspect_key]['negative']}条)
-  - 中性评价: {get_sentiment_percentage(aspect_key, 'neutral')} ({stats[aspect_key]['neutral']}条)
-  - 复杂评价: {get_sentiment_percentage(aspect_key, 'mixed')} ({stats[aspect_key]['mixed']}条)
-• 典型评价:"""
-            for comment_data in analysis_result['详细评价'][aspect_key][:3]:
-                report += f"""
-  * {comment_data['comment']} 
-    (来自: {comment_data['region']}, 款式: {comment_data['model']}, 评分: {comment_data['score']})"""
-
-        report += """
-
-核心发现
-------------------
-"""
-        # 添加一些数据分析见解
-        report += self._generate_insights(analysis_result)
-        
-        return report
-
-    def _generate_insights(self, analysis_result: Dict) -> str:
-        """生成数据分析见解"""
-        insights = []
-        regional_stats = analysis_result['地域统计']
-        model_stats = analysis_result['款式统计']
-        
-        # 找出最受欢迎的地区
-        if regional_stats:  # 添加检查
-            best_region = max(regional_stats.items(), 
-                             key=lambda x: x[1]['avg_score'])
-            insights.append(f"• {best_region[0]}地区的用户评价最高，平均评分达到{best_region[1]['avg_score']:.1f}分")
-        
-        # 找出最受欢迎的款式
-        if model_stats:  # 添加检查
-            best_model = max(model_stats.items(), 
-                            key=lambda x: x[1]['avg_score'])
-            insights.append(f"• {best_model[0]}是最受欢迎的款式，平均评分为{best_model[1]['avg_score']:.1f}分")
+    输入为 analyze_reviews 生成的详细分析行（也可从 *_analysis.xlsx 读回），
+    不需要再调用API。
+    """
+    # 初始化统计数据
+    aspect_stats = {
+        aspect: {'positive': 0, 'negative': 0, 'neutral': 0, 'mixed': 0, 'mentioned': 0}
+        for aspect in ASPECT_COLUMNS
+    }
+    
+    regional_stats = {}  # 地域统计
+    model_stats = {}    # 款式统计
+    score_stats = {1: 0, 2: 0, 3: 0, 4: 0, 5: 0}  # 评分统计
+    
+    detailed_comments = {aspect: [] for aspect in ASPECT_COLUMNS}
+    positive_keys = {key: positive_key for key, _, _, positive_key in ASPECTS}
+    
+    for row in analysis_details:
+        region = row['地区']
+        model = row['商品款式']
+        score = int(row['评分'])
         
-        # 分析功能特点
-        stats = analysis_result['各方面统计']
-        aspects = [
-            ('AI功能', 'ai_feature'),
-            ('音质', 'sound_quality'),
-            ('外观', 'appearance')
-        ]
+        # 更新地域和款式统计
+        for stats, key in ((regional_stats, region), (model_stats, model)):
+            if key not in stats:
+                stats[key] = {'count': 0, **{positive_key: 0 for positive_key in positive_keys.values()}, 'avg_score': 0.0}
+            stats[key]['count'] += 1
+            stats[key]['avg_score'] += score
         
-        # 计算各方面的满意度
-        satisfactions = {}
-        for name, key in aspects:
-            if stats[key]['mentioned'] > 0:
-                satisfaction = (stats[key]['positive'] + stats[key]['mixed'] * 0.5) / stats[key]['mentioned'] * 100
-                satisfactions[name] = satisfaction
+        # 更新评分统计
+        score_stats[score] += 1
         
-        # 找出最强和弱的方面
-        if satisfactions:  # 添加检查
-            best_aspect = max(satisfactions.items(), key=lambda x: x[1])
-            worst_aspect = min(satisfactions.items(), key=lambda x: x[1])
+        # 更新各方面统计
+        for aspect, prefix in ASPECT_COLUMNS.items():
+            if not row[f'{prefix}_提及']:
+                continue
+            sentiment = row[f'{prefix}_情感']
+            comment = row[f'{prefix}_具体评价']
+            aspect_stats[aspect]['mentioned'] += 1
+            aspect_stats[aspect][sentiment] += 1
+            if comment:
+                detailed_comments[aspect].append({
+                    'comment': comment,
+                    'region': region,
+                    'model': model,
+                    'score': score
+                })
             
-            insights.append(f"• 产品最强的方面是{best_aspect[0]}，满意度达到{best_aspect[1]:.1f}%")
-            insights.append(f"• 最需要改进的方面是{worst_aspect[0]}，满意度为{worst_aspect[1]:.1f}%")
-        else:
-            insights.append("• 暂无足够的评论数据来分析产品特点")
-        
-        # 添加地域特征分析
-        if regional_stats:  # 添加检查
-            for region, data in regional_stats.items():
-                if data['count'] >= analysis_result['总评论数'] * 0.1:  # 样本量达到10%以上的地区
-                    features = []
-                    if data['ai_positive'] / data['count'] > 0.7:
-                        features.append("AI功能")
-                    if data['sound_positive'] / data['count'] > 0.7:
-                        features.append("音质")
-                    if data['appearance_positive'] / data['count'] > 0.7:
-                        features.append("外观")
-                    
-                    if features:
-                        insights.append(f"• {region}的用户特别关注{'、'.join(features)}等特性")
-        
-        return "\n".join(insights) if insights else "暂无足够的数据生成分析见解"
+            # 更新地域和款式的正面评价统计
+            if sentiment == 'positive':
+                regional_stats[region][positive_keys[aspect]] += 1
+                model_stats[model][positive_keys[aspect]] += 1
+    
+    # 计算地域和款式的平均分
+    for region in regional_stats:
+        regional_stats[region]['avg_score'] /= regional_stats[region]['count']
+    for model in model_stats:
+        model_stats[model]['avg_score'] /= model_stats[model]['count']
+    
+    return {
+        '总评论数': len(analysis_details),
+        '各方面统计': aspect_stats,
+        '地域统计': regional_stats,
+        '款式统计': model_stats,
+        '评分统计': score_stats,
+        '详细评价': detailed_comments
+    }
+
+def load_analysis_details(analysis_file: str) -> List[Dict]:
+    """读取 analyze_reviews 生成的详细分析Excel"""
+    import pandas as pd
+
+    df = pd.read_excel(analysis_file).fillna('')
+    return df.to_dict('records')
 
 def main():
     # 创建必要的目录
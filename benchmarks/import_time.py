@@ -0,0 +1,103 @@
+"""启动耗时基准
+
+每次在全新的解释器中导入模块/执行命令，统计耗时中位数，
+并检查轻量命令是否意外加载了重量级依赖。
+
+用法: python benchmarks/import_time.py [--repeat 5]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ['pandas', 'numpy', 'openai', 'requests', 'selenium', 'undetected_chromedriver', 'bs4', 'lxml']
+
+# (名称, 在新解释器中执行的代码)
+CASES = [
+    ('python', 'pass'),
+    ('import report', 'import report'),
+    ('import analyze', 'import analyze'),
+    ('import jd_crawl', 'import jd_crawl'),
+    ('import jd_parser', 'import jd_parser'),
+    ('import cli', 'import cli'),
+    ('cli report --help', "import sys, cli; sys.argv = ['cli.py', 'report', '--help']\n"
+                          "try:\n    cli.main()\nexcept SystemExit:\n    pass"),
+]
+
+# 渲染基准用的最小统计结果，结构与 analyze/aggregate 保存的JSON一致
+FIXTURE = {
+    '商品SKU': 'benchmark',
+    '总评论数': 20,
+    '各方面统计': {
+        'ai_feature': {'positive': 9, 'negative': 1, 'neutral': 0, 'mixed': 1, 'mentioned': 11},
+        'sound_quality': {'positive': 11, 'negative': 1, 'neutral': 2, 'mixed': 0, 'mentioned': 14},
+        'appearance': {'positive': 16, 'negative': 0, 'neutral': 0, 'mixed': 0, 'mentioned': 16}
+    },
+    '地域统计': {
+        '江苏': {'count': 12, 'ai_positive': 5, 'sound_positive': 7, 'appearance_positive': 10, 'avg_score': 4.9},
+        '广东': {'count': 8, 'ai_positive': 4, 'sound_positive': 4, 'appearance_positive': 6, 'avg_score': 4.8}
+    },
+    '款式统计': {
+        '小钱包-流光银': {'count': 20, 'ai_positive': 9, 'sound_positive': 11, 'appearance_positive': 16, 'avg_score': 4.9}
+    },
+    '评分统计': {'1': 0, '2': 0, '3': 1, '4': 0, '5': 19},
+    '详细评价': {
+        'ai_feature': [{'comment': '和豆包聊了一会，体验还挺好', 'region': '广东', 'model': '小钱包-流光银', 'score': 5}],
+        'sound_quality': [{'comment': '低音厚、中音清、高音亮', 'region': '江苏', 'model': '小钱包-流光银', 'score': 5}],
+        'appearance': []
+    }
+}
+
+CHECK_HEAVY = ("import sys\n"
+               "{code}\n"
+               "print('HEAVY:' + ','.join(m for m in {heavy!r} if m in sys.modules))")
+
+
+def run_case(code: str, repeat: int) -> float:
+    """返回多次执行的耗时中位数（秒）"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', code], cwd=ROOT, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def loaded_heavy_modules(code: str) -> str:
+    """返回执行代码后已加载的重量级模块"""
+    result = subprocess.run([sys.executable, '-c', CHECK_HEAVY.format(code=code, heavy=HEAVY_MODULES)],
+                            cwd=ROOT, check=True, capture_output=True, text=True)
+    return result.stdout.rsplit('HEAVY:', 1)[-1].strip()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="启动耗时基准")
+    parser.add_argument('--repeat', type=int, default=5, help="每项重复次数")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        fixture_file = os.path.join(tmp_dir, 'benchmark_analysis.json')
+        with open(fixture_file, 'w', encoding='utf-8') as f:
+            json.dump(FIXTURE, f, ensure_ascii=False)
+
+        # 实际执行一次 report 渲染（读取JSON、生成全部格式、写文件）
+        report_argv = ['cli.py', 'report', fixture_file, '--output-dir', os.path.join(tmp_dir, 'output'),
+                       '--formats', 'text', 'markdown', 'html', 'json']
+        cases = CASES + [('cli report render', f"import sys, cli; sys.argv = {report_argv!r}; cli.main()")]
+
+        print(f"{'命令':<22}{'耗时(ms)':>10}  已加载的重量级模块")
+        for name, code in cases:
+            elapsed = run_case(code, args.repeat)
+            heavy = loaded_heavy_modules(code) or '-'
+            print(f"{name:<22}{elapsed * 1000:>10.1f}  {heavy}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+import argparse
+import os
+
+# 各子命令只在自己的处理函数内导入所需模块，
+# 例如 report 不会加载 pandas / openai / selenium
+
+DEFAULT_PRODUCT_URL = "https://item.jd.com/100119535525.html#comment"
+REPORT_FORMATS = ['text', 'markdown', 'html', 'json']
+
+
+def default_sku(path: str) -> str:
+    """未指定SKU时使用文件名（去掉 _analysis 后缀）作为SKU"""
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return stem[:-len('_analysis')] if stem.endswith('_analysis') else stem
+
+
+def crawl(args):
+    """爬取商品评论并保存为CSV"""
+    from jd_crawl import JDReviewSpider
+
+    spider = JDReviewSpider()
+    spider.init_driver()
+    try:
+        spider.login()
+        print(f"开始爬取商品评论: {args.url}")
+        reviews_data = spider.get_reviews(args.url, max_pages=args.max_pages, extract_mode=args.extract,
+                                          archive_dir=args.archive_dir, workers=args.workers)
+        if reviews_data:
+            spider.save_to_excel(reviews_data, args.output)
+            print(f"共采集到 {len(reviews_data)} 条评论")
+    finally:
+        spider.driver.quit()
+
+
+def parse(args):
+    """离线重新解析归档的原始页面，不需要浏览器"""
+    from jd_crawl import JDReviewSpider
+    from jd_parser import parse_archive
+
+    reviews_data = parse_archive(args.archive_dir, workers=args.workers)
+    print(f"共解析出 {len(reviews_data)} 条评论")
+    if reviews_data:
+        JDReviewSpider().save_to_excel(reviews_data, args.output)
+
+
+def analyze(args):
+    """调用API逐条分析评论，保存分析结果并生成报告"""
+    from analyze import JDReviewAnalyzer
+    from report import save_analysis_result, write_reports
+
+    api_key = os.getenv("DEEPSEEK_API_KEY")
+    if not api_key:
+        raise ValueError("请设置DEEPSEEK_API_KEY环境变量")
+
+    analyzer = JDReviewAnalyzer(api_key)
+    analysis_result = analyzer.analyze_reviews(args.input, limit=args.limit)
+    analysis_result['商品SKU'] = args.sku or default_sku(args.input)
+    result_file = os.path.splitext(analysis_result['分析文件'])[0] + '.json'
+    save_analysis_result(analysis_result, result_file)
+    print(f"详细分析结果已保存至: {analysis_result['分析文件']}")
+    print(f"统计结果已保存至: {result_file}")
+
+    sku = analysis_result['商品SKU']
+    for report_file in write_reports({sku: analysis_result}, args.output_dir, args.formats):
+        print(f"分析报告已保存至: {report_file}")
+
+
+def aggregate(args):
+    """从已有的详细分析Excel重新汇总统计结果，不调用API"""
+    from analyze import aggregate_analysis, load_analysis_details
+    from report import save_analysis_result
+
+    analysis_result = aggregate_analysis(load_analysis_details(args.input))
+    analysis_result['分析文件'] = args.input
+    analysis_result['商品SKU'] = args.sku or default_sku(args.input)
+    output = args.output or os.path.splitext(args.input)[0] + '.json'
+    save_analysis_result(analysis_result, output)
+    print(f"统计结果已保存至: {output}")
+
+
+def report(args):
+    """从统计结果JSON批量渲染报告"""
+    from report import load_analysis_result, write_reports
+
+    analysis_results = {}
+    sources = {}
+    for path in args.inputs:
+        analysis_result = load_analysis_result(path)
+        sku = analysis_result.get('商品SKU') or default_sku(path)
+        if sku in analysis_results:
+            raise ValueError(f"SKU重复: {sku} ({sources[sku]}, {path})，请在 analyze/aggregate 时用 --sku 指定")
+        analysis_results[sku] = analysis_result
+        sources[sku] = path
+    for report_file in write_reports(analysis_results, args.output_dir, args.formats):
+        print(f"分析报告已保存至: {report_file}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """构建命令行参数解析器"""
+    parser = argparse.ArgumentParser(description="京东商品评论爬取与分析工具")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    crawl_parser = subparsers.add_parser('crawl', help="爬取商品评论")
+    crawl_parser.add_argument('--url', default=DEFAULT_PRODUCT_URL, help="商品页面URL")
+    crawl_parser.add_argument('--max-pages', type=int, default=1000, help="最多爬取的页数")
+    crawl_parser.add_argument('--output', default='jd_reviews.csv', help="保存到 data/input 下的文件名")
+    crawl_parser.add_argument('--extract', choices=['live', 'page_source'], default='live',
+                              help="live: 逐条查询页面元素; page_source: 每页取一次源码在本地解析")
+    crawl_parser.add_argument('--archive-dir', help="保存原始页面的目录，仅 page_source 模式有效")
+    crawl_parser.add_argument('--workers', type=int, help="解析页面的进程数")
+    crawl_parser.set_defaults(func=crawl)
+
+    parse_parser = subparsers.add_parser('parse', help="离线重新解析归档的原始页面")
+    parse_parser.add_argument('archive_dir', help="原始页面目录")
+    parse_parser.add_argument('--output', default='jd_reviews.csv', help="保存到 data/input 下的文件名")
+    parse_parser.add_argument('--workers', type=int, help="解析页面的进程数")
+    parse_parser.set_defaults(func=parse)
+
+    analyze_parser = subparsers.add_parser('analyze', help="调用API分析评论并生成报告")
+    analyze_parser.add_argument('--input', default='data/input/jd_reviews.csv', help="评论CSV文件")
+    analyze_parser.add_argument('--limit', type=int, default=100, help="最多分析的评论数，0表示全部")
+    analyze_parser.add_argument('--sku', help="商品SKU，保存在统计结果中，默认使用输入文件名")
+    analyze_parser.add_argument('--output-dir', default='data/output', help="报告输出目录")
+    analyze_parser.add_argument('--formats', nargs='+', choices=REPORT_FORMATS, default=['text'], help="报告格式")
+    analyze_parser.set_defaults(func=analyze)
+
+    aggregate_parser = subparsers.add_parser('aggregate', help="从详细分析Excel重新汇总统计结果")
+    aggregate_parser.add_argument('--input', default='data/input/jd_reviews_analysis.xlsx', help="详细分析Excel文件")
+    aggregate_parser.add_argument('--output', help="统计结果JSON文件，默认与输入同名")
+    aggregate_parser.add_argument('--sku', help="商品SKU，保存在统计结果中，默认使用输入文件名")
+    aggregate_parser.set_defaults(func=aggregate)
+
+    report_parser = subparsers.add_parser('report', help="从统计结果JSON渲染报告，可一次传入多个SKU")
+    report_parser.add_argument('inputs', nargs='+', help="统计结果JSON文件，SKU取自其中保存的商品SKU")
+    report_parser.add_argument('--output-dir', default='data/output', help="报告输出目录")
+    report_parser.add_argument('--formats', nargs='+', choices=REPORT_FORMATS, default=['text'], help="报告格式")
+    report_parser.set_defaults(func=report)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
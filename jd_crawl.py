@@ -1,15 +1,11 @@
-import requests
-from bs4 import BeautifulSoup
-import pandas as pd
 import time
-import undetected_chromedriver as uc
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-import random
 import json
-from selenium.webdriver.common.action_chains import ActionChains
 import os
+from concurrent.futures import ProcessPoolExecutor
+from jd_parser import parse_page, save_page
+
+# selenium / undetected_chromedriver / pandas 只在需要浏览器或保存数据时导入，
+# 以便不需要浏览器的命令可以快速启动
 
 class JDReviewSpider:
     def __init__(self):
@@ -23,6 +19,8 @@ class JDReviewSpider:
         """初始化undetected_chromedriver"""
         print("正在初始化浏览器驱动...")
         try:
+            import undetected_chromedriver as uc
+
             options = uc.ChromeOptions()
             options.add_argument('--disable-gpu')
             options.add_argument('--no-sandbox')
@@ -42,6 +40,10 @@ class JDReviewSpider:
 
     def login(self):
         """使用扫码登录京东账号"""
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+
         try:
             print("正在尝试扫码登录...")
             
@@ -75,9 +77,20 @@ class JDReviewSpider:
             print("当前URL:", self.driver.current_url)
             raise
 
-    def get_reviews(self, product_url, max_pages=1000):
-        """获取商品评论信息"""
+    def get_reviews(self, product_url, max_pages=1000, extract_mode='live', archive_dir=None, workers=None):
+        """获取商品评论信息
+
+        extract_mode 为 'live' 时通过WebDriver元素逐条提取；
+        为 'page_source' 时每页只取一次页面源码，由进程池用BeautifulSoup/lxml解析，
+        并可通过 archive_dir 保存原始页面以便日后离线重新解析。
+        """
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+
         reviews_data = []
+        pending_pages = []
+        executor = ProcessPoolExecutor(max_workers=workers) if extract_mode == 'page_source' else None
         try:
             print(f"正在访问页面: {product_url}")
             self.driver.get(product_url)
@@ -103,78 +116,24 @@ class JDReviewSpider:
                     EC.presence_of_element_located((By.CLASS_NAME, "comment-item"))
                 )
                 
-                # 获取评论列表
-                comments = self.driver.find_elements(By.CLASS_NAME, "comment-item")
-                if not comments:
-                    print("没有找到更多评论，结束爬取")
-                    break
-                    
-                print(f"当前页面找到 {len(comments)} 条评论")
-                
-                # 提取当前页面的评论
-                for comment in comments:
-                    try:
-                        # 获取用户ID
-                        user_id = comment.get_attribute("data-guid")
-                        
-                        # 获取用户信息
-                        user_info = comment.find_element(By.CLASS_NAME, "user-info")
-                        try:
-                            user_level = comment.find_element(By.CLASS_NAME, "user-level").text
-                        except:
-                            user_level = ""
-                        
-                        # 获取评论内容
-                        comment_text = comment.find_element(By.CLASS_NAME, "comment-con").text
-                        
-                        # 获取评论星级
-                        try:
-                            star_div = comment.find_element(By.CSS_SELECTOR, "div[class^='comment-star star']")
-                            # 从class名称中提取星级数字
-                            star_class = star_div.get_attribute("class")
-                            comment_star = int(star_class.split("star")[-1])
-                        except:
-                            comment_star = 0
-                        
-                        # 获取订单信息
-                        order_info = {}
-                        try:
-                            order_info_div = comment.find_element(By.CLASS_NAME, "order-info")
-                            spans = order_info_div.find_elements(By.TAG_NAME, "span")
-                            if spans:
-                                order_info = {
-                                    '商品型号': spans[0].text if len(spans) > 0 else "",
-                                    '购买时间': spans[3].text if len(spans) > 3 else "",
-                                    '购买地点': spans[4].text if len(spans) > 4 else ""
-                                }
-                        except:
-                            pass
-                        
-                        # 获取评论图片（如果有的话）
-                        images = []
-                        try:
-                            pic_list = comment.find_element(By.CLASS_NAME, "J-pic-list")
-                            image_elements = pic_list.find_elements(By.TAG_NAME, "img")
-                            images = [img.get_attribute("src") for img in image_elements]
-                        except:
-                            pass
-                        
-                        review_data = {
-                            '用户ID': user_id,
-                            '用户等级': user_level,
-                            '评论内容': comment_text,
-                            '评分': comment_star,
-                            '商品型号': order_info.get('商品型号', ''),
-                            '购买时间': order_info.get('购买时间', ''),
-                            '购买地点': order_info.get('购买地点', ''),
-                            '评论图片': images
-                        }
-                        
-                        reviews_data.append(review_data)
+                if extract_mode == 'page_source':
+                    # 每页只取一次页面源码，交给进程池在本地解析
+                    html = self.driver.page_source
+                    if archive_dir:
+                        save_page(html, archive_dir, page)
+                    pending_pages.append(executor.submit(parse_page, html))
+                    print("已获取当前页面源码")
+                else:
+                    # 获取评论列表
+                    comments = self.driver.find_elements(By.CLASS_NAME, "comment-item")
+                    if not comments:
+                        print("没有找到更多评论，结束爬取")
+                        break
                         
-                    except Exception as e:
-                        print(f"提取单条评论数据时出错: {str(e)}")
-                        continue
+                    print(f"当前页面找到 {len(comments)} 条评论")
+                    
+                    # 提取当前页面的评论
+                    reviews_data.extend(self._extract_comments(comments))
                 
                 # 尝试点击下一页 - 使用更精确的选择器
                 try:
@@ -234,16 +193,96 @@ class JDReviewSpider:
                 except Exception as e:
                     print(f"翻页失败: {str(e)}")
                     break
-                    
-            print(f"\n总共成功提取 {len(reviews_data)} 条评论")
                 
         except Exception as e:
             print(f"获取评论出错: {str(e)}")
+        finally:
+            if executor is not None:
+                for future in pending_pages:
+                    try:
+                        reviews_data.extend(future.result())
+                    except Exception as e:
+                        print(f"解析页面源码时出错: {str(e)}")
+                executor.shutdown()
             
+        # page_source 模式的评论在进程池结果收集后才齐全
+        print(f"\n总共成功提取 {len(reviews_data)} 条评论")
+        return reviews_data
+
+    def _extract_comments(self, comments):
+        """通过WebDriver元素查询逐条提取评论"""
+        from selenium.webdriver.common.by import By
+
+        reviews_data = []
+        for comment in comments:
+            try:
+                # 获取用户ID
+                user_id = comment.get_attribute("data-guid")
+                
+                # 获取用户信息
+                user_info = comment.find_element(By.CLASS_NAME, "user-info")
+                try:
+                    user_level = comment.find_element(By.CLASS_NAME, "user-level").text
+                except:
+                    user_level = ""
+                
+                # 获取评论内容
+                comment_text = comment.find_element(By.CLASS_NAME, "comment-con").text
+                
+                # 获取评论星级
+                try:
+                    star_div = comment.find_element(By.CSS_SELECTOR, "div[class^='comment-star star']")
+                    # 从class名称中提取星级数字
+                    star_class = star_div.get_attribute("class")
+                    comment_star = int(star_class.split("star")[-1])
+                except:
+                    comment_star = 0
+                
+                # 获取订单信息
+                order_info = {}
+                try:
+                    order_info_div = comment.find_element(By.CLASS_NAME, "order-info")
+                    spans = order_info_div.find_elements(By.TAG_NAME, "span")
+                    if spans:
+                        order_info = {
+                            '商品型号': spans[0].text if len(spans) > 0 else "",
+                            '购买时间': spans[3].text if len(spans) > 3 else "",
+                            '购买地点': spans[4].text if len(spans) > 4 else ""
+                        }
+                except:
+                    pass
+                
+                # 获取评论图片（如果有的话）
+                images = []
+                try:
+                    pic_list = comment.find_element(By.CLASS_NAME, "J-pic-list")
+                    image_elements = pic_list.find_elements(By.TAG_NAME, "img")
+                    images = [img.get_attribute("src") for img in image_elements]
+                except:
+                    pass
+                
+                review_data = {
+                    '用户ID': user_id,
+                    '用户等级': user_level,
+                    '评论内容': comment_text,
+                    '评分': comment_star,
+                    '商品型号': order_info.get('商品型号', ''),
+                    '购买时间': order_info.get('购买时间', ''),
+                    '购买地点': order_info.get('购买地点', ''),
+                    '评论图片': images
+                }
+                
+                reviews_data.append(review_data)
+                
+            except Exception as e:
+                print(f"提取单条评论数据时出错: {str(e)}")
+                continue
         return reviews_data
 
     def save_to_excel(self, data, filename='jd_reviews.csv'):
         """保存评论数据到CSV"""
+        import pandas as pd
+
         try:
             # 检查data/input目录是否存在，没有则创建
             input_dir = os.path.join('data', 'input')
@@ -0,0 +1,104 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+# BeautifulSoup / lxml 只在真正解析时导入，保持命令行启动轻量
+
+
+def _text(element) -> str:
+    """按浏览器显示效果取元素文本，与WebDriver的 .text 保持一致
+
+    <br> 换行，其余行内节点直接拼接，源码中的空白折叠为单个空格。
+    元素不存在时返回空字符串。
+    """
+    if element is None:
+        return ''
+    from bs4 import Comment, NavigableString
+
+    lines = [[]]
+    for node in element.descendants:
+        if getattr(node, 'name', None) == 'br':
+            lines.append([])
+        elif isinstance(node, NavigableString) and not isinstance(node, Comment):
+            lines[-1].append(str(node))
+    return '\n'.join(' '.join(''.join(line).split()) for line in lines).strip()
+
+
+def parse_comment_item(item) -> Optional[Dict]:
+    """从单个 comment-item 节点提取评论，字段与实时抓取保持一致"""
+    # 与实时抓取一样，缺少用户信息或评论内容的节点直接跳过
+    if item.select_one('.user-info') is None:
+        return None
+    content = item.select_one('.comment-con')
+    if content is None:
+        return None
+
+    # 从class名称中提取星级数字，如 "comment-star star5"
+    comment_star = 0
+    star_div = item.select_one('div.comment-star')
+    if star_div is not None:
+        try:
+            comment_star = int(' '.join(star_div.get('class', [])).split('star')[-1])
+        except ValueError:
+            pass
+
+    spans = item.select('.order-info span')
+
+    # 页面里的图片地址通常省略协议，补全为与浏览器一致的绝对地址
+    images = []
+    for img in item.select('.J-pic-list img'):
+        src = img.get('src', '')
+        images.append('https:' + src if src.startswith('//') else src)
+
+    return {
+        '用户ID': item.get('data-guid'),
+        '用户等级': _text(item.select_one('.user-level')),
+        '评论内容': _text(content),
+        '评分': comment_star,
+        '商品型号': _text(spans[0]) if len(spans) > 0 else '',
+        '购买时间': _text(spans[3]) if len(spans) > 3 else '',
+        '购买地点': _text(spans[4]) if len(spans) > 4 else '',
+        '评论图片': images
+    }
+
+
+def parse_page(html: str) -> List[Dict]:
+    """解析一页评论的HTML源码"""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, 'lxml')
+    reviews = []
+    for item in soup.select('.comment-item'):
+        review = parse_comment_item(item)
+        if review is not None:
+            reviews.append(review)
+    return reviews
+
+
+def parse_page_file(filename: str) -> List[Dict]:
+    """解析保存在本地的页面文件"""
+    with open(filename, encoding='utf-8') as f:
+        return parse_page(f.read())
+
+
+def save_page(html: str, archive_dir: str, page: int) -> str:
+    """把页面源码存入归档目录，文件名按页码排序"""
+    os.makedirs(archive_dir, exist_ok=True)
+    filename = os.path.join(archive_dir, f'page_{page:04d}.html')
+    with open(filename, 'w', encoding='utf-8') as f:
+        f.write(html)
+    return filename
+
+
+def parse_archive(archive_dir: str, workers: Optional[int] = None) -> List[Dict]:
+    """用进程池离线重新解析归档目录下的所有页面，按文件名顺序返回评论"""
+    files = sorted(
+        os.path.join(archive_dir, name)
+        for name in os.listdir(archive_dir)
+        if name.endswith('.html')
+    )
+    reviews = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for page_reviews in executor.map(parse_page_file, files):
+            reviews.extend(page_reviews)
+    return reviews
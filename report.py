@@ -0,0 +1,382 @@
+import html
+import json
+import os
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+# (统计键, 功能分析标题, 简称, 地域/款式统计中的好评键)
+ASPECTS = [
+    ('ai_feature', 'AI功能', 'AI功能', 'ai_positive'),
+    ('sound_quality', '音质体验', '音质', 'sound_positive'),
+    ('appearance', '外观设计', '外观', 'appearance_positive'),
+]
+
+SENTIMENTS = [
+    ('positive', '正面评价'),
+    ('negative', '负面评价'),
+    ('neutral', '中性评价'),
+    ('mixed', '复杂评价'),
+]
+
+FILE_EXTENSIONS = {
+    'text': 'txt',
+    'markdown': 'md',
+    'html': 'html',
+    'json': 'json',
+}
+
+
+def _percent(part: float, whole: float) -> float:
+    """计算百分比，分母为0时返回0"""
+    return part / whole * 100 if whole else 0.0
+
+
+class ReportAggregate:
+    """单个商品的报告聚合数据
+
+    所有占比、好评率和见解都在构造时一次算好，各模板只负责填充，
+    同一份聚合数据可以被多种格式重复渲染。
+    """
+
+    def __init__(self, analysis_result: Dict, generated_at: Optional[str] = None):
+        self.total = analysis_result['总评论数']
+        self.generated_at = generated_at or datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+        # JSON 读回的评分统计键是字符串，这里统一成整数
+        score_stats = {int(k): v for k, v in analysis_result['评分统计'].items()}
+        self.avg_score = sum(s * c for s, c in score_stats.items()) / self.total if self.total else 0.0
+        self.scores = [
+            {'star': star, 'count': score_stats.get(star, 0),
+             'share': _percent(score_stats.get(star, 0), self.total)}
+            for star in (5, 4, 3, 2, 1)
+        ]
+
+        # 保留原始顺序用于见解计算，按评论数排序的列表用于展示
+        self.regions = [self._group_row(name, data) for name, data in analysis_result['地域统计'].items()]
+        self.models = [self._group_row(name, data) for name, data in analysis_result['款式统计'].items()]
+        self.top_regions = sorted(self.regions, key=lambda x: x['count'], reverse=True)[:5]
+        self.sorted_models = sorted(self.models, key=lambda x: x['count'], reverse=True)
+
+        stats = analysis_result['各方面统计']
+        details = analysis_result.get('详细评价', {})
+        self.aspects = []
+        for key, title, short, _ in ASPECTS:
+            data = stats[key]
+            mentioned = data['mentioned']
+            self.aspects.append({
+                'key': key,
+                'title': title,
+                'short': short,
+                'mentioned': mentioned,
+                'mention_share': _percent(mentioned, self.total),
+                'sentiments': [
+                    {'label': label, 'count': data[sentiment],
+                     'share': _percent(data[sentiment], mentioned)}
+                    for sentiment, label in SENTIMENTS
+                ],
+                'satisfaction': (data['positive'] + data['mixed'] * 0.5) / mentioned * 100 if mentioned else None,
+                'comments': details.get(key, [])[:3],
+            })
+
+        self.insights = self._build_insights()
+
+    def _group_row(self, name: str, data: Dict) -> Dict:
+        """地域/款式的一行统计"""
+        count = data['count']
+        row = {
+            'name': name,
+            'count': count,
+            'share': _percent(count, self.total),
+            'avg_score': data['avg_score'],
+        }
+        for key, _, _, positive_key in ASPECTS:
+            row[key] = _percent(data[positive_key], count)
+        return row
+
+    def _build_insights(self) -> List[str]:
+        """基于聚合数据生成分析见解"""
+        insights = []
+
+        if self.regions:
+            best_region = max(self.regions, key=lambda x: x['avg_score'])
+            insights.append(f"{best_region['name']}地区的用户评价最高，平均评分达到{best_region['avg_score']:.1f}分")
+
+        if self.models:
+            best_model = max(self.models, key=lambda x: x['avg_score'])
+            insights.append(f"{best_model['name']}是最受欢迎的款式，平均评分为{best_model['avg_score']:.1f}分")
+
+        satisfactions = [(a['short'], a['satisfaction']) for a in self.aspects if a['satisfaction'] is not None]
+        if satisfactions:
+            best_aspect = max(satisfactions, key=lambda x: x[1])
+            worst_aspect = min(satisfactions, key=lambda x: x[1])
+            insights.append(f"产品最强的方面是{best_aspect[0]}，满意度达到{best_aspect[1]:.1f}%")
+            insights.append(f"最需要改进的方面是{worst_aspect[0]}，满意度为{worst_aspect[1]:.1f}%")
+        else:
+            insights.append("暂无足够的评论数据来分析产品特点")
+
+        # 样本量达到10%以上的地区
+        for region in self.regions:
+            if region['count'] >= self.total * 0.1:
+                features = [short for key, _, short, _ in ASPECTS if region[key] > 70]
+                if features:
+                    insights.append(f"{region['name']}的用户特别关注{'、'.join(features)}等特性")
+
+        return insights
+
+    def to_dict(self) -> Dict:
+        """转换为可序列化的字典"""
+        return {
+            'total': self.total,
+            'generated_at': self.generated_at,
+            'avg_score': round(self.avg_score, 2),
+            'scores': self.scores,
+            'regions': sorted(self.regions, key=lambda x: x['count'], reverse=True),
+            'models': self.sorted_models,
+            'aspects': self.aspects,
+            'insights': self.insights,
+        }
+
+
+TEXT_TEMPLATES = {
+    'document': """
+京东商品评论分析报告
+==================================================
+分析样本: {total}条评论
+分析时间: {generated_at}
+
+评分分布
+------------------
+• 总体评分: {avg_score:.1f}
+• 评分分布:{scores}
+
+地域分析
+------------------
+{regions}
+
+款式分析
+------------------
+{models}
+
+功能分析
+------------------
+{aspects}
+
+核心发现
+------------------{insights}""",
+    'score': "\n  - {star}星: {share:.1f}% ({count}条)",
+    'region': """
+• {name}:
+  - 评论数量: {count}条 ({share:.1f}%)
+  - 平均评分: {avg_score:.1f}
+  - AI功能好评率: {ai_feature:.1f}%
+  - 音质好评率: {sound_quality:.1f}%
+  - 外观好评率: {appearance:.1f}%""",
+    'model': """
+• {name}:
+  - 销量占比: {share:.1f}% ({count}条)
+  - 平均评分: {avg_score:.1f}
+  - AI功能好评率: {ai_feature:.1f}%
+  - 音质好评率: {sound_quality:.1f}%
+  - 外观好评率: {appearance:.1f}%""",
+    'aspect': """
+{title}:
+• 提及率: {mention_share:.1f}% ({mentioned}/{total})
+• 情感分布:{sentiments}
+• 典型评价:{comments}""",
+    'sentiment': "\n  - {label}: {share} ({count}条)",
+    'comment': """
+  * {comment} 
+    (来自: {region}, 款式: {model}, 评分: {score})""",
+    'insight': "\n• {text}",
+}
+
+MARKDOWN_TEMPLATES = {
+    'document': """# 京东商品评论分析报告
+
+- 分析样本: {total}条评论
+- 分析时间: {generated_at}
+
+## 评分分布
+
+总体评分: **{avg_score:.1f}**
+
+| 评分 | 占比 | 数量 |
+| --- | --- | --- |{scores}
+
+## 地域分析
+
+| 地区 | 评论数量 | 占比 | 平均评分 | AI功能好评率 | 音质好评率 | 外观好评率 |
+| --- | --- | --- | --- | --- | --- | --- |{regions}
+
+## 款式分析
+
+| 款式 | 评论数量 | 销量占比 | 平均评分 | AI功能好评率 | 音质好评率 | 外观好评率 |
+| --- | --- | --- | --- | --- | --- | --- |{models}
+
+## 功能分析
+{aspects}
+
+## 核心发现
+{insights}
+""",
+    'score': "\n| {star}星 | {share:.1f}% | {count} |",
+    'region': "\n| {name} | {count} | {share:.1f}% | {avg_score:.1f} | {ai_feature:.1f}% | {sound_quality:.1f}% | {appearance:.1f}% |",
+    'model': "\n| {name} | {count} | {share:.1f}% | {avg_score:.1f} | {ai_feature:.1f}% | {sound_quality:.1f}% | {appearance:.1f}% |",
+    'aspect': """
+### {title}
+
+- 提及率: {mention_share:.1f}% ({mentioned}/{total})
+- 情感分布:{sentiments}
+- 典型评价:{comments}
+""",
+    'sentiment': "\n  - {label}: {share} ({count}条)",
+    'comment': "\n  - {comment}（来自: {region}, 款式: {model}, 评分: {score}）",
+    'insight': "\n- {text}",
+}
+
+HTML_TEMPLATES = {
+    'document': """<!DOCTYPE html>
+<html lang="zh-CN">
+<head>
+<meta charset="utf-8">
+<title>京东商品评论分析报告</title>
+</head>
+<body>
+<h1>京东商品评论分析报告</h1>
+<p>分析样本: {total}条评论<br>分析时间: {generated_at}</p>
+<h2>评分分布</h2>
+<p>总体评分: <strong>{avg_score:.1f}</strong></p>
+<table>
+<tr><th>评分</th><th>占比</th><th>数量</th></tr>{scores}
+</table>
+<h2>地域分析</h2>
+<table>
+<tr><th>地区</th><th>评论数量</th><th>占比</th><th>平均评分</th><th>AI功能好评率</th><th>音质好评率</th><th>外观好评率</th></tr>{regions}
+</table>
+<h2>款式分析</h2>
+<table>
+<tr><th>款式</th><th>评论数量</th><th>销量占比</th><th>平均评分</th><th>AI功能好评率</th><th>音质好评率</th><th>外观好评率</th></tr>{models}
+</table>
+<h2>功能分析</h2>{aspects}
+<h2>核心发现</h2>
+<ul>{insights}
+</ul>
+</body>
+</html>
+""",
+    'score': "\n<tr><td>{star}星</td><td>{share:.1f}%</td><td>{count}</td></tr>",
+    'region': "\n<tr><td>{name}</td><td>{count}</td><td>{share:.1f}%</td><td>{avg_score:.1f}</td><td>{ai_feature:.1f}%</td><td>{sound_quality:.1f}%</td><td>{appearance:.1f}%</td></tr>",
+    'model': "\n<tr><td>{name}</td><td>{count}</td><td>{share:.1f}%</td><td>{avg_score:.1f}</td><td>{ai_feature:.1f}%</td><td>{sound_quality:.1f}%</td><td>{appearance:.1f}%</td></tr>",
+    'aspect': """
+<h3>{title}</h3>
+<p>提及率: {mention_share:.1f}% ({mentioned}/{total})</p>
+<ul>{sentiments}
+</ul>
+<ul>{comments}
+</ul>""",
+    'sentiment': "\n<li>{label}: {share} ({count}条)</li>",
+    'comment': "\n<li>{comment}<br><small>来自: {region}, 款式: {model}, 评分: {score}</small></li>",
+    'insight': "\n<li>{text}</li>",
+}
+
+TEMPLATES = {
+    'text': TEXT_TEMPLATES,
+    'markdown': MARKDOWN_TEMPLATES,
+    'html': HTML_TEMPLATES,
+}
+
+
+def save_analysis_result(analysis_result: Dict, filename: str) -> None:
+    """把分析结果保存为JSON，供 report 命令重新渲染"""
+    with open(filename, 'w', encoding='utf-8') as f:
+        json.dump(analysis_result, f, ensure_ascii=False, indent=2)
+
+
+def load_analysis_result(filename: str) -> Dict:
+    """读取 save_analysis_result 保存的分析结果"""
+    with open(filename, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def render_report(aggregate: ReportAggregate, fmt: str = 'text') -> str:
+    """按指定格式渲染报告，支持 text/markdown/html/json"""
+    if fmt == 'json':
+        return json.dumps(aggregate.to_dict(), ensure_ascii=False, indent=2)
+    if fmt not in TEMPLATES:
+        raise ValueError(f"不支持的报告格式: {fmt}")
+
+    templates = TEMPLATES[fmt]
+    escape = html.escape if fmt == 'html' else str
+
+    def group(template: str, row: Dict) -> str:
+        return template.format(**dict(row, name=escape(str(row['name']))))
+
+    aspects = []
+    for aspect in aggregate.aspects:
+        # 未被提及的方面沿用原报告的 "0%" 写法
+        sentiments = ''.join(
+            templates['sentiment'].format(**dict(s, share=f"{s['share']:.1f}%" if aspect['mentioned'] else "0%"))
+            for s in aspect['sentiments']
+        )
+        comments = ''.join(
+            templates['comment'].format(
+                comment=escape(str(c['comment'])),
+                region=escape(str(c['region'])),
+                model=escape(str(c['model'])),
+                score=c['score'],
+            )
+            for c in aspect['comments']
+        )
+        aspects.append(templates['aspect'].format(
+            title=aspect['title'],
+            mention_share=aspect['mention_share'],
+            mentioned=aspect['mentioned'],
+            total=aggregate.total,
+            sentiments=sentiments,
+            comments=comments,
+        ))
+
+    return templates['document'].format(
+        total=aggregate.total,
+        generated_at=aggregate.generated_at,
+        avg_score=aggregate.avg_score,
+        scores=''.join(templates['score'].format(**s) for s in aggregate.scores),
+        regions=''.join(group(templates['region'], r) for r in aggregate.top_regions),
+        models=''.join(group(templates['model'], m) for m in aggregate.sorted_models),
+        aspects=''.join(aspects),
+        insights=''.join(templates['insight'].format(text=escape(i)) for i in aggregate.insights),
+    )
+
+
+def render_reports(analysis_results: Dict[str, Dict], fmt: str = 'text',
+                   generated_at: Optional[str] = None) -> Dict[str, str]:
+    """批量渲染多个商品(SKU)的报告，返回 {sku: 报告内容}"""
+    generated_at = generated_at or datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    return {
+        sku: render_report(ReportAggregate(result, generated_at), fmt)
+        for sku, result in analysis_results.items()
+    }
+
+
+def write_reports(analysis_results: Dict[str, Dict], output_dir: str = 'data/output',
+                  formats: Iterable[str] = ('text',)) -> List[str]:
+    """批量生成报告文件，每个SKU的聚合数据只计算一次并复用于所有格式"""
+    os.makedirs(output_dir, exist_ok=True)
+    now = datetime.now()
+    generated_at = now.strftime('%Y-%m-%d %H:%M:%S')
+    timestamp = now.strftime('%Y%m%d_%H%M%S')
+    formats = list(formats)
+    for fmt in formats:
+        if fmt not in FILE_EXTENSIONS:
+            raise ValueError(f"不支持的报告格式: {fmt}")
+
+    report_files = []
+    for sku, result in analysis_results.items():
+        aggregate = ReportAggregate(result, generated_at)
+        for fmt in formats:
+            report_file = os.path.join(
+                output_dir, f"analysis_report_{sku}_{timestamp}.{FILE_EXTENSIONS[fmt]}")
+            with open(report_file, 'w', encoding='utf-8') as f:
+                f.write(render_report(aggregate, fmt))
+            report_files.append(report_file)
+    return report_files